@@ -144,6 +144,12 @@ class CacheItem:
     def tags(self):
         return self._tags
 
+    @property
+    def nbytes(self):
+        """The memory occupied by the stored array, zero for other objects."""
+        if isinstance(self._value, np.ndarray):
+            return self._value.nbytes
+        return 0
 
     def clear(self):
         """Mark the item as invalid and clear the contents of the object.
@@ -184,8 +190,14 @@ class Cache:
        used to avoid recomputation or reallocation.
     """
 
-    def __init__(self):
+    def __init__(self, max_reuse_nbytes=128*1024**2):
+        """Initialize an empty cache.
+
+        Arrays larger than ``max_reuse_nbytes`` bytes are always deallocated when they
+        are cleared, instead of being kept for reuse. When it is None, all arrays are kept.
+        """
         self._store = {}
+        self.max_reuse_nbytes = max_reuse_nbytes
 
     def clear(self, **kwargs):
         """Clear all items in the cache
@@ -194,6 +206,7 @@ class Cache:
 
            dealloc
                 When set to True, the items are really removed from memory.
+                Arrays larger than ``max_reuse_nbytes`` are always removed.
 
            tags
                 Limit the items cleared to those who have at least one tag
@@ -219,7 +232,8 @@ class Cache:
            **Optional arguments:**
 
            dealloc
-                When set to True, the item is really removed from memory.
+                When set to True, the item is really removed from memory. Arrays
+                larger than ``max_reuse_nbytes`` are always removed.
         """
         key = _normalize_key(key)
         dealloc = kwargs.pop('dealloc', False)
@@ -228,6 +242,8 @@ class Cache:
         item = self._store.get(key)
         if item is None:
             return
+        if self.max_reuse_nbytes is not None and item.nbytes > self.max_reuse_nbytes:
+            dealloc = True
         cleared = False
         if not dealloc:
             cleared = item.clear()
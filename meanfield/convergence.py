@@ -90,5 +90,5 @@ def convergence_error_commutator(ham, overlap, *dms):
     errorsq = 0.0
     for i in range(ham.ndm):
         commutator = compute_commutator(dms[i], focks[i], overlap)
-        errorsq += np.einsum('ab,ab', commutator, commutator)
+        errorsq += np.vdot(commutator, commutator)
     return errorsq ** 0.5
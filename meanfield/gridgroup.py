@@ -61,6 +61,8 @@ class GridGroup(Observable):
             use derivatives of the density or the orbitals, i.e. GGA and MGGA functionals.
         """
         self.grid_terms = grid_terms
+        # The DF level is fixed by the grid terms, so it is determined only once.
+        self._df_level = max([grid_term.df_level for grid_term in grid_terms])
         self.obasis = obasis
         assert self._grid_compatible(grid)
         self.grid = grid
@@ -85,7 +87,7 @@ class GridGroup(Observable):
             * ``DF_LEVEL_GGA``: GGA (and LDA) functionals are used.
             * ``DF_LEVEL_MGGA``: MGGA (and LDA and/or GGA) functionals are used.
         """
-        return max([grid_term.df_level for grid_term in self.grid_terms])
+        return self._df_level
 
     def _get_potentials(self, cache, label='pot', tags=None):
         """Get list of output arrays passed to ```GridObservable.add_pot```.
@@ -230,32 +232,28 @@ class GridGroup(Observable):
         focks : list of TwoIndex
             A list of Fock matrices.
         """
-        for ichannel in range(len(focks)):
-            if self.df_level == DF_LEVEL_LDA:
-                try:
-                    self.obasis.compute_grid_density_fock(
-                        self.grid.points, self.grid.weights,
-                        pots[ichannel][:, 0], focks[ichannel])
-                except AttributeError:
-                    raise AttributeError(
-                        "Obasis object has not implemented 'compute_grid_density_fock'")
-
-            elif self.df_level == DF_LEVEL_GGA:
-                try:
-                    self.obasis.compute_grid_gga_fock(
-                        self.grid.points, self.grid.weights,
-                        pots[ichannel], focks[ichannel])
-                except AttributeError:
-                    raise AttributeError(
-                        "Obasis object has not implemented 'compute_grid_gga_fock'")
-            elif self.df_level == DF_LEVEL_MGGA:
-                try:
-                    self.obasis.compute_grid_mgga_fock(
-                        self.grid.points, self.grid.weights,
-                        pots[ichannel], focks[ichannel])
-                except AttributeError:
-                    raise AttributeError(
-                        "Obasis object has not implemeneted 'compute_grid_mgga_fock'")
+        # Select the grid-Fock-build routine and look up the grid data only once for all
+        # spin channels.
+        df_level = self.df_level
+        if df_level == DF_LEVEL_LDA:
+            name = 'compute_grid_density_fock'
+        elif df_level == DF_LEVEL_GGA:
+            name = 'compute_grid_gga_fock'
+        elif df_level == DF_LEVEL_MGGA:
+            name = 'compute_grid_mgga_fock'
+        else:
+            raise ValueError('Internal error: non-existent DF level.')
+        try:
+            grid_fock = getattr(self.obasis, name)
+        except AttributeError:
+            raise AttributeError("Obasis object has not implemented '%s'" % name)
+        points = self.grid.points
+        weights = self.grid.weights
+        for pot, fock in zip(pots, focks):
+            if df_level == DF_LEVEL_LDA:
+                grid_fock(points, weights, pot[:, 0], fock)
+            else:
+                grid_fock(points, weights, pot, fock)
 
     def add_fock(self, cache, *focks):
         """Add contributions to the Fock matrix.
@@ -20,6 +20,8 @@
 # --
 """Mean-field DFT/HF Hamiltonian data structures"""
 
+import numpy as np
+
 from .cache import Cache
 from .utils import doc_inherit
 
@@ -59,12 +61,8 @@ class EffHam:
             wavefunction, e.g. nuclear-nuclear interactions or QM/MM mechanical embedding
             terms. Use ``nn`` as key for the nuclear-nuclear term.
         """
-        # check arguments:
-        if len(terms) == 0:
-            raise ValueError('At least one term must be present in the Hamiltonian.')
-
         # Assign attributes
-        self.terms = list(terms)
+        self.terms = terms
         self.external = {} if external is None else external
 
         # Create a cache for shared intermediate results. This cache should only
@@ -72,6 +70,41 @@ class EffHam:
         # need to be updated at each SCF cycle.
         self.cache = Cache()
 
+    @property
+    def terms(self):
+        """The terms in the Hamiltonian, a tuple with instances of Observable."""
+        return self._terms
+
+    @terms.setter
+    def terms(self, terms):
+        # check arguments:
+        if len(terms) == 0:
+            raise ValueError('At least one term must be present in the Hamiltonian.')
+        self._terms = tuple(terms)
+        # Keys under which the energy of each term is stored in the cache.
+        self._energy_keys = ['energy_%s' % term.label for term in self._terms]
+        self._linear_terms = [term for term in self._terms if term.linear]
+        self._nonlinear_terms = [term for term in self._terms if not term.linear]
+        self.invalidate()
+
+    def invalidate(self):
+        """Discard the summed Fock contributions of the linear terms.
+
+        The Fock contributions of the linear terms do not depend on the density matrices.
+        Their sum is computed when the first Fock matrix is built and ``reset`` keeps it.
+        Call this method after modifying the operators of the terms in place. Assigning
+        new terms to ``terms`` calls it automatically.
+        """
+        self._linear_focks = None
+
+    @property
+    def quadratic(self):
+        """True when the energy is at most quadratic in the density matrices.
+
+        In that case, the Fock matrices are linear functions of the density matrices.
+        """
+        return all(term.quadratic for term in self.terms)
+
     def reset(self, *dms):
         """Remove intermediate results from cache and specify new input density matrices.
 
@@ -107,9 +140,9 @@ class EffHam:
             ``external`` argument of the constructor
         """
         total = 0.0
-        for term in self.terms:
+        for term, key in zip(self.terms, self._energy_keys):
             energy = term.compute_energy(self.cache)
-            self.cache['energy_%s' % term.label] = energy
+            self.cache[key] = energy
             total += energy
         for key, energy in self.external.items():
             self.cache['energy_%s' % key] = energy
@@ -123,8 +156,8 @@ class EffHam:
         print("5: " + "-" * 70)
         print('5:                                               term                 Value')
         print("5: " + "-" * 70)
-        for term in self.terms:
-            energy = self.cache['energy_%s' % term.label]
+        for term, key in zip(self.terms, self._energy_keys):
+            energy = self.cache[key]
             print('5: %50s  %20.12f' % (term.label, energy))
         for key, energy in self.external.items():
             print('5: %50s  %20.12f' % (key, energy))
@@ -148,10 +181,15 @@ class EffHam:
         fock1, fock2, ... : TwoIndex
             A list of output Fock operators. Old content is discarded.
         """
-        for fock in focks:
-            fock[:] = 0.0
-        # Loop over all terms and add contributions to the Fock matrix.
-        for term in self.terms:
+        if self._linear_focks is None:
+            self._linear_focks = [np.zeros(fock.shape) for fock in focks]
+            for term in self._linear_terms:
+                term.add_fock(self.cache, *self._linear_focks)
+        # Start from the summed contributions of all linear terms.
+        for fock, linear_fock in zip(focks, self._linear_focks):
+            fock[:] = linear_fock
+        # Loop over all remaining terms and add contributions to the Fock matrix.
+        for term in self._nonlinear_terms:
             term.add_fock(self.cache, *focks)
 
     def compute_dot_hessian(self, *outputs):
@@ -174,8 +212,8 @@ class EffHam:
         for output in outputs:
             output[:] = 0.0
         # Loop over all terms and add contributions to the output two-index
-        # objects.
-        for term in self.terms:
+        # objects. The linear terms have a zero Hessian and are skipped.
+        for term in self._nonlinear_terms:
             term.add_dot_hessian(self.cache, *outputs)
 
 
@@ -30,6 +30,7 @@ __all__ = [
     'RTwoIndexTerm', 'UTwoIndexTerm',
     'RDirectTerm', 'UDirectTerm',
     'RExchangeTerm', 'UExchangeTerm',
+    'RJKTerm',
 ]
 
 
@@ -63,8 +64,21 @@ class Observable:
     These are usually energy expressions (as function of one or more density matrices).
     One may also use this for other observables, e.g. to construct a Lagrangian instead of
     a regular effective Hamiltonian.
+
+    Attributes
+    ----------
+    linear : bool
+        True when the observable is linear in the density matrices. The Fock contribution
+        of such a term does not depend on the density matrices and its contribution to
+        the dot product with the Hessian is zero.
+    quadratic : bool
+        True when the observable is at most quadratic in the density matrices. The Fock
+        contribution of such a term is a linear function of the density matrices.
     """
 
+    linear = False
+    quadratic = False
+
     def __init__(self, label):
         """Initialize an Observable instance.
 
@@ -121,6 +135,9 @@ class Observable:
 class RTwoIndexTerm(Observable):
     """Observable linear in the density matrix (restricted)."""
 
+    linear = True
+    quadratic = True
+
     def __init__(self, op_alpha, label):
         """Initialize a RTwoIndexTerm instance.
 
@@ -137,7 +154,9 @@ class RTwoIndexTerm(Observable):
 
     @doc_inherit(Observable)
     def compute_energy(self, cache):
-        return 2 * np.einsum('ab,ba', self.op_alpha, cache['dm_alpha'])
+        # The operator is symmetric, so the trace of the product reduces to a flat dot
+        # product, which is dispatched directly to BLAS.
+        return 2 * np.vdot(self.op_alpha, cache['dm_alpha'])
 
     @doc_inherit(Observable)
     def add_fock(self, cache, fock_alpha):
@@ -151,6 +170,9 @@ class RTwoIndexTerm(Observable):
 class UTwoIndexTerm(Observable):
     """Observable linear in the density matrix (unrestricted)."""
 
+    linear = True
+    quadratic = True
+
     def __init__(self, op_alpha, label, op_beta=None):
         """Initialize a RTwoIndexTerm instance.
 
@@ -170,16 +192,11 @@ class UTwoIndexTerm(Observable):
 
     @doc_inherit(Observable)
     def compute_energy(self, cache):
-        if self.op_alpha is self.op_beta:
-            # when both operators are references to the same object, take a
-            # shortcut
-            compute_dm_full(cache)
-            return np.einsum('ab,ba', self.op_alpha, cache['dm_full'])
-        else:
-            # If the operator is different for different spins, do the normal
-            # thing.
-            return np.einsum('ab,ba', self.op_alpha, cache['dm_alpha']) + \
-                   np.einsum('ab,ba', self.op_beta, cache['dm_beta'])
+        # The energy is computed per spin, even when both operators are the same object,
+        # to avoid allocating the spin-summed density matrix. (The operators are
+        # symmetric, see RTwoIndexTerm.)
+        return np.vdot(self.op_alpha, cache['dm_alpha']) + \
+            np.vdot(self.op_beta, cache['dm_beta'])
 
     @doc_inherit(Observable)
     def add_fock(self, cache, fock_alpha, fock_beta):
@@ -206,8 +223,9 @@ def contract_direct(op, dm):
         tmp = np.tensordot(op, dm, axes=([(1, 2), (1, 0)]))
         return np.tensordot(op, tmp, [0, 0])
     elif op.ndim == 4:
-        # Normal case
-        return np.einsum('abcd,bd->ac', op, dm)
+        # Normal case: a stack of matrix-vector products, one for each (a, b), such that
+        # the work is done by (threaded) BLAS instead of einsum's inner loops.
+        return np.matmul(op, dm[:, :, None]).sum(axis=1)[:, :, 0]
     else:
         raise NotImplementedError
 
@@ -215,6 +233,8 @@ def contract_direct(op, dm):
 class RDirectTerm(Observable):
     """Direct term of the expectation value of a two-body operator (restricted)."""
 
+    quadratic = True
+
     def __init__(self, op_alpha, label):
         """Initialize a RDirectTerm instance.
 
@@ -247,7 +267,7 @@ class RDirectTerm(Observable):
     def compute_energy(self, cache):
         self._update_direct(cache)
         direct = cache.load('op_%s_alpha' % self.label)
-        return np.einsum('ab,ba', direct, cache['dm_alpha'])
+        return np.vdot(direct, cache['dm_alpha'])
 
     @doc_inherit(Observable)
     def add_fock(self, cache, fock_alpha):
@@ -264,6 +284,8 @@ class RDirectTerm(Observable):
 class UDirectTerm(Observable):
     """Direct term of the expectation value of a two-body operator (unrestricted)."""
 
+    quadratic = True
+
     def __init__(self, op_alpha, label, op_beta=None):
         """Initialize a UDirectTerm instance.
 
@@ -308,7 +330,7 @@ class UDirectTerm(Observable):
             # This branch is nearly always going to be followed in practice.
             direct = cache['op_%s' % self.label]
             dm_full = cache['dm_full']
-            return 0.5 * np.einsum('ab,ab', direct, dm_full)
+            return 0.5 * np.vdot(direct, dm_full)
         else:
             # This is probably never going to happen. In case it does, please
             # add the proper code here.
@@ -331,8 +353,9 @@ class UDirectTerm(Observable):
     def add_dot_hessian(self, cache, output_alpha, output_beta):
         if self.op_alpha is self.op_beta:
             delta_dm_full = compute_dm_full(cache, prefix='delta_', tags='d')
-            output_alpha += contract_direct(self.op_alpha, delta_dm_full)
-            output_beta += contract_direct(self.op_alpha, delta_dm_full)
+            delta_direct = contract_direct(self.op_alpha, delta_dm_full)
+            output_alpha += delta_direct
+            output_beta += delta_direct
         else:
             # This is probably never going to happen. In case it does, please
             # add the proper code here.
@@ -354,14 +377,45 @@ def contract_exchange(op, dm):
         tmp = np.tensordot(op, dm, axes=([1, 1]))
         return np.tensordot(op, tmp, ([0, 2], [0, 2]))
     elif op.ndim == 4:
-        return np.einsum('abcd,cb->ad', op, dm)
+        # The summed indexes (b, c) are contiguous, which turns this into a stack of
+        # matrix-vector products handled by BLAS.
+        nbasis = dm.shape[0]
+        return np.matmul(dm.T.ravel(), op.reshape(nbasis, nbasis * nbasis, nbasis))
     else:
         raise NotImplementedError
 
 
+def contract_exchange_pair(op, dm_alpha, dm_beta):
+    """Perform exchange-type contractions of one operator with two density matrices.
+
+    Parameters
+    ----------
+    op : np.ndarray, shape=(nbasis, nbasis, nbasis, nbasis) or (nvec, nbasis, nbasis)
+        The four-index operator or its Cholesky decomposition with nvec vectors.
+    dm_alpha, dm_beta : np.ndarray, shape=(nbasis, nbasis)
+        The density matrices
+
+    Returns
+    -------
+    exchange_alpha, exchange_beta : np.ndarray, shape=(nbasis, nbasis)
+        The same results as two calls to ``contract_exchange``.
+    """
+    if op.ndim == 4:
+        # Both contractions are done in one stack of matrix products, such that the
+        # four-index operator is only streamed from memory once.
+        nbasis = dm_alpha.shape[0]
+        dms_flat = np.array([dm_alpha.T.ravel(), dm_beta.T.ravel()])
+        result = np.matmul(dms_flat, op.reshape(nbasis, nbasis * nbasis, nbasis))
+        return result[:, 0], result[:, 1]
+    else:
+        return contract_exchange(op, dm_alpha), contract_exchange(op, dm_beta)
+
+
 class RExchangeTerm(Observable):
     """Exchange term of the expectation value of a two-body operator (restricted)."""
 
+    quadratic = True
+
     def __init__(self, op_alpha, label, fraction=1.0):
         """Initialize a RExchangeTerm instance.
 
@@ -398,7 +452,7 @@ class RExchangeTerm(Observable):
         self._update_exchange(cache)
         exchange_alpha = cache['op_%s_alpha' % self.label]
         dm_alpha = cache['dm_alpha']
-        return -self.fraction * np.einsum('ab,ba', exchange_alpha, dm_alpha)
+        return -self.fraction * np.vdot(exchange_alpha, dm_alpha)
 
     @doc_inherit(Observable)
     def add_fock(self, cache, fock_alpha):
@@ -412,9 +466,111 @@ class RExchangeTerm(Observable):
         output_alpha -= (0.5 * self.fraction) * contract_exchange(self.op_alpha, delta_dm_alpha)
 
 
+def contract_direct_exchange(op, dm):
+    """Perform the direct- and exchange-type contractions with a four-index operator at once.
+
+    Parameters
+    ----------
+    op : np.ndarray, shape=(nbasis, nbasis, nbasis, nbasis) or (nvec, nbasis, nbasis)
+        The four-index operator or its Cholesky decomposition with nvec vectors.
+    dm : np.ndarray, shape=(nbasis, nbasis)
+        The density matrix
+
+    Returns
+    -------
+    direct, exchange : np.ndarray, shape=(nbasis, nbasis)
+        The same results as ``contract_direct`` and ``contract_exchange``.
+    """
+    if op.ndim == 3:
+        # Cholesky decomposition: there is no common work to share.
+        return contract_direct(op, dm), contract_exchange(op, dm)
+    elif op.ndim == 4:
+        # Loop over the first index, such that each slice of the operator only has to be
+        # loaded from memory once for both contractions.
+        nbasis = dm.shape[0]
+        direct = np.zeros(dm.shape)
+        exchange = np.zeros(dm.shape)
+        dm_stack = dm[:, :, None]
+        dm_flat = dm.T.ravel()
+        for a in range(nbasis):
+            direct[a] = np.matmul(op[a], dm_stack).sum(axis=0)[:, 0]
+            exchange[a] = np.dot(dm_flat, op[a].reshape(nbasis * nbasis, nbasis))
+        return direct, exchange
+    else:
+        raise NotImplementedError
+
+
+class RJKTerm(Observable):
+    """Direct and exchange terms of a two-body operator, computed together (restricted).
+
+    This is equivalent to the combination of an RDirectTerm and an RExchangeTerm with the
+    same operator, but the four-index operator is only traversed once to construct both
+    contributions.
+    """
+
+    quadratic = True
+
+    def __init__(self, op_alpha, label, fraction=1.0):
+        """Initialize a RJKTerm instance.
+
+        Parameters
+        ----------
+        op_alpha : np.ndarray, shape=(nbasis, nbasis, nbasis, nbasis) or (nvec, nbasis, nbasis)
+            Expansion of two-body operator in basis of alpha orbitals, or its Cholesky
+            decomposition with nvec vectors. Same is used for beta orbitals.
+        label : str
+            A short string to identify the observable.
+        fraction : float
+            Amount of exchange to be included (1.0 corresponds to 100%).
+        """
+        self.op_alpha = op_alpha
+        self.fraction = fraction
+        Observable.__init__(self, label)
+
+    def _update_direct_exchange(self, cache):
+        """Recompute the direct and exchange operators if they have become invalid.
+
+        Parameters
+        ----------
+        cache : Cache
+            Used to store intermediate results that can be reused or inspected later.
+        """
+        dm_alpha = cache['dm_alpha']
+        direct, new_direct = cache.load('op_%s_direct_alpha' % self.label,
+                                        alloc=dm_alpha.shape)
+        exchange, new_exchange = cache.load('op_%s_exchange_alpha' % self.label,
+                                            alloc=dm_alpha.shape)
+        if new_direct or new_exchange:
+            direct[:], exchange[:] = contract_direct_exchange(self.op_alpha, dm_alpha)
+            direct *= 2  # contribution from beta electrons is identical
+
+    @doc_inherit(Observable)
+    def compute_energy(self, cache):
+        self._update_direct_exchange(cache)
+        direct = cache['op_%s_direct_alpha' % self.label]
+        exchange = cache['op_%s_exchange_alpha' % self.label]
+        dm_alpha = cache['dm_alpha']
+        return np.vdot(direct, dm_alpha) - self.fraction * np.vdot(exchange, dm_alpha)
+
+    @doc_inherit(Observable)
+    def add_fock(self, cache, fock_alpha):
+        self._update_direct_exchange(cache)
+        fock_alpha += cache['op_%s_direct_alpha' % self.label]
+        fock_alpha -= self.fraction * cache['op_%s_exchange_alpha' % self.label]
+
+    @doc_inherit(Observable)
+    def add_dot_hessian(self, cache, output_alpha):
+        delta_dm_alpha = cache.load('delta_dm_alpha')
+        direct, exchange = contract_direct_exchange(self.op_alpha, delta_dm_alpha)
+        output_alpha += direct
+        output_alpha -= (0.5 * self.fraction) * exchange
+
+
 class UExchangeTerm(Observable):
     """Exchange term of the expectation value of a two-body operator (unrestricted)."""
 
+    quadratic = True
+
     def __init__(self, op_alpha, label, fraction=1.0, op_beta=None):
         """Initialize a UExchangeTerm instance.
 
@@ -444,18 +600,21 @@ class UExchangeTerm(Observable):
         cache : Cache
             Used to store intermediate results that can be reused or inspected later.
         """
-        # alpha
         dm_alpha = cache['dm_alpha']
-        exchange_alpha, new = cache.load('op_%s_alpha' % self.label,
-                                         alloc=dm_alpha.shape)
-        if new:
-            exchange_alpha[:] = contract_exchange(self.op_alpha, dm_alpha)
-        # beta
+        exchange_alpha, new_alpha = cache.load('op_%s_alpha' % self.label,
+                                               alloc=dm_alpha.shape)
         dm_beta = cache['dm_beta']
-        exchange_beta, new = cache.load('op_%s_beta' % self.label,
-                                        alloc=dm_beta.shape)
-        if new:
-            exchange_beta[:] = contract_exchange(self.op_beta, dm_beta)
+        exchange_beta, new_beta = cache.load('op_%s_beta' % self.label,
+                                             alloc=dm_beta.shape)
+        if new_alpha and new_beta and self.op_alpha is self.op_beta:
+            # This branch is nearly always going to be followed in practice.
+            exchange_alpha[:], exchange_beta[:] = contract_exchange_pair(
+                self.op_alpha, dm_alpha, dm_beta)
+        else:
+            if new_alpha:
+                exchange_alpha[:] = contract_exchange(self.op_alpha, dm_alpha)
+            if new_beta:
+                exchange_beta[:] = contract_exchange(self.op_beta, dm_beta)
 
     @doc_inherit(Observable)
     def compute_energy(self, cache):
@@ -464,8 +623,8 @@ class UExchangeTerm(Observable):
         exchange_beta = cache['op_%s_beta' % self.label]
         dm_alpha = cache['dm_alpha']
         dm_beta = cache['dm_beta']
-        return (-0.5 * self.fraction) * np.einsum('ab,ba', exchange_alpha, dm_alpha) + \
-               (-0.5 * self.fraction) * np.einsum('ab,ba', exchange_beta, dm_beta)
+        return (-0.5 * self.fraction) * (np.vdot(exchange_alpha, dm_alpha) +
+                                         np.vdot(exchange_beta, dm_beta))
 
     @doc_inherit(Observable)
     def add_fock(self, cache, fock_alpha, fock_beta):
@@ -478,6 +637,12 @@ class UExchangeTerm(Observable):
     @doc_inherit(Observable)
     def add_dot_hessian(self, cache, output_alpha, output_beta):
         delta_dm_alpha = cache.load('delta_dm_alpha')
-        output_alpha -= self.fraction * contract_exchange(self.op_alpha, delta_dm_alpha)
         delta_dm_beta = cache.load('delta_dm_beta')
-        output_beta -= self.fraction * contract_exchange(self.op_beta, delta_dm_beta)
+        if self.op_alpha is self.op_beta:
+            delta_exchange_alpha, delta_exchange_beta = contract_exchange_pair(
+                self.op_alpha, delta_dm_alpha, delta_dm_beta)
+        else:
+            delta_exchange_alpha = contract_exchange(self.op_alpha, delta_dm_alpha)
+            delta_exchange_beta = contract_exchange(self.op_beta, delta_dm_beta)
+        output_alpha -= self.fraction * delta_exchange_alpha
+        output_beta -= self.fraction * delta_exchange_beta
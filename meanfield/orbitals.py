@@ -168,12 +168,10 @@ class Orbitals:
         eps : float
             The allowed deviation from unity, very loose by default.
         """
-        for i in range(self.nfn):
-            if self.occupations[i] == 0:
-                continue
-            norm = np.dot(self._coeffs[:, i], np.dot(overlap, self._coeffs[:, i]))
-            # print i, norm
-            assert abs(norm - 1) < eps, 'The orbitals are not normalized!'
+        # The overlap matrix is applied to all occupied orbitals in a single product.
+        coeffs = self._coeffs[:, self.occupations != 0]
+        norms = np.einsum('ai,ai->i', coeffs, np.dot(overlap, coeffs))
+        assert (abs(norms - 1) < eps).all(), 'The orbitals are not normalized!'
 
     def check_orthonormality(self, overlap, eps=1e-4):
         """Check that the occupied orbitals are orthogonal and normalized.
@@ -187,17 +185,11 @@ class Orbitals:
         eps : float
             The allowed deviation from unity, very loose by default.
         """
-        for i0 in range(self.nfn):
-            if self.occupations[i0] == 0:
-                continue
-            for i1 in range(i0 + 1):
-                if self.occupations[i1] == 0:
-                    continue
-                dot = np.dot(self._coeffs[:, i0], np.dot(overlap, self._coeffs[:, i1]))
-                if i0 == i1:
-                    assert abs(dot - 1) < eps
-                else:
-                    assert abs(dot) < eps
+        # Overlap matrix of all occupied orbitals at once.
+        coeffs = self._coeffs[:, self.occupations != 0]
+        dots = np.dot(coeffs.T, np.dot(overlap, coeffs))
+        dots.ravel()[::len(dots) + 1] -= 1
+        assert (abs(dots) < eps).all()
 
     def error_eigen(self, fock, overlap):
         """Compute the error of the orbitals with respect to the eigenproblem.
@@ -214,9 +206,11 @@ class Orbitals:
         error : float
             The RMSD error on the orbital energies.
         """
-        errors = np.dot(fock, self.coeffs) \
-                 - self.energies * np.dot(overlap, self.coeffs)
-        return np.sqrt((abs(errors) ** 2).mean())
+        errors = np.dot(fock, self.coeffs)
+        scaled = np.dot(overlap, self.coeffs)
+        scaled *= self.energies
+        errors -= scaled
+        return np.sqrt(np.vdot(errors, errors) / errors.size)
 
     def from_fock(self, fock, overlap):
         """Diagonalize a Fock matrix to obtain orbitals and energies.
@@ -265,25 +259,20 @@ class Orbitals:
 
         # Build clusters of degenerate orbitals. Rely on the fact that the
         # energy levels are sorted (one way or the other).
-        clusters = []
-        begin = 0
-        for ifn in range(1, self.nfn):
-            if abs(self.energies[ifn] - self.energies[ifn - 1]) > epstol:
-                end = ifn
-                clusters.append([begin, end])
-                begin = ifn
-        end = self.nfn
-        clusters.append([begin, end])
+        bounds = np.flatnonzero(abs(np.diff(self.energies)) > epstol) + 1
+        bounds = np.concatenate([[0], bounds, [self.nfn]])
+        clusters = zip(bounds[:-1], bounds[1:])
 
         # Lift degeneracies using the density matrix
         sds = np.dot(overlap.T, np.dot(dm, overlap))
+        # Apply sds to all orbitals at once instead of once per cluster.
+        sds_coeffs = np.dot(sds, self.coeffs)
         for begin, end in clusters:
             if end - begin == 1:
-                self.occupations[begin] = np.dot(self.coeffs[:, begin],
-                                                 np.dot(sds, self.coeffs[:, begin]))
+                self.occupations[begin] = np.dot(self.coeffs[:, begin], sds_coeffs[:, begin])
             else:
                 # Build matrix
-                mat = np.dot(self.coeffs[:, begin:end].T, np.dot(sds, self.coeffs[:, begin:end]))
+                mat = np.dot(self.coeffs[:, begin:end].T, sds_coeffs[:, begin:end])
                 # Diagonalize and reverse order
                 evals, evecs = np.linalg.eigh(mat)
                 evals = evals[::-1]
@@ -292,9 +281,8 @@ class Orbitals:
                 self.coeffs[:, begin:end] = np.dot(self.coeffs[:, begin:end], evecs)
                 # Compute expectation values
                 self.occupations[begin:end] = evals
-                for i0 in range(end - begin):
-                    self.energies[begin + i0] = np.dot(self.coeffs[:, begin + i0],
-                                                       np.dot(fock, self.coeffs[:, begin + i0]))
+                coeffs = self.coeffs[:, begin:end]
+                self.energies[begin:end] = np.einsum('ai,ai->i', coeffs, np.dot(fock, coeffs))
 
     def derive_naturals(self, dm, overlap):
         """Derive natural orbitals from a given density matrix and assign the result to self.
@@ -378,13 +366,16 @@ class Orbitals:
 
     lumo_energy = property(get_lumo_energy)
 
-    def to_dm(self, other=None):
+    def to_dm(self, other=None, out=None):
         """Compute the density matrix.
 
         Parameters
         ----------
         other : Orbitals
             Another Orbitals object to construct a transfer-density matrix.
+        out : np.ndarray, shape=(nbasis, nbasis)
+            An optional (C-contiguous) output array. When given, the density matrix is
+            written into it instead of allocating a new array.
 
         Returns
         -------
@@ -392,10 +383,10 @@ class Orbitals:
             The density matrix.
         """
         if other is None:
-            return np.dot(self._coeffs * self.occupations, self._coeffs.T)
+            return np.dot(self._coeffs * self.occupations, self._coeffs.T, out=out)
         else:
             return np.dot(self._coeffs * (self.occupations * other.occupations) ** 0.5,
-                          other._coeffs.T)
+                          other._coeffs.T, out=out)
 
     def rotate_random(self):
         """Apply random unitary transformation distributed with Haar measure.
@@ -90,13 +90,13 @@ class PlainSCFSolver:
         print("5: " + "-" * 70)
 
         focks = [np.zeros(overlap.shape) for i in range(ham.ndm)]
-        dms = [None] * ham.ndm
+        dms = [np.zeros(overlap.shape) for i in range(ham.ndm)]
         converged = False
         counter = 0
         while self.maxiter is None or counter < self.maxiter:
             # convert the orbital expansions to density matrices
             for i in range(ham.ndm):
-                dms[i] = orbs[i].to_dm()
+                orbs[i].to_dm(out=dms[i])
             # feed the latest density matrices in the hamiltonian
             ham.reset(*dms)
             # Construct the Fock operator
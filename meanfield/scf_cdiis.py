@@ -105,7 +105,7 @@ class CDIISHistory(DIISHistory):
                 state1 = self.stack[i1]
                 cdot = 0.0
                 for j in range(self.ndm):
-                    cdot += np.einsum('ab,ab', state0.commutators[j], state1.commutators[j])
+                    cdot += np.vdot(state0.commutators[j], state1.commutators[j])
                 self.cdots[i0, i1] = cdot
                 self.cdots[i1, i0] = cdot
 
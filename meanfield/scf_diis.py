@@ -25,7 +25,7 @@ import numpy as np
 from .convergence import convergence_error_commutator
 from .exceptions import NoSCFConvergence
 from .orbitals import Orbitals, check_dm
-from .utils import compute_commutator
+from .utils import axpby, compute_commutator
 
 __all__ = []
 
@@ -316,7 +316,7 @@ class DIISState:
             self.dms[i][:] = dms[i]
             self.focks[i][:] = focks[i]
             self.commutators[i][:] = compute_commutator(dms[i], focks[i], self.overlap)
-            self.normsq += np.einsum('ab,ab', self.commutators[i], self.commutators[i])
+            self.normsq += np.vdot(self.commutators[i], self.commutators[i])
 
 
 class DIISHistory:
@@ -471,7 +471,7 @@ class DIISHistory:
             errorsq = 0.0
             for i in range(self.ndm):
                 self.commutator = compute_commutator(dms_output[i], focks_output[i], self.overlap)
-                errorsq += np.einsum('ab,ab', self.commutator, self.commutator)
+                errorsq += np.vdot(self.commutator, self.commutator)
             return errorsq ** 0.5
 
     def _linear_combination(self, coeffs, ops, output):
@@ -490,4 +490,4 @@ class DIISHistory:
         """
         output[:] = 0
         for i in range(self.nused):
-            output += coeffs[i] * ops[i]
+            axpby(coeffs[i], ops[i], 1.0, output)
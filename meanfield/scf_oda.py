@@ -21,16 +21,28 @@
 """Optimal Damping SCF algorithm"""
 
 import numpy as np
-import matplotlib.pyplot as pt
 
 from .exceptions import NoSCFConvergence
 from .convergence import convergence_error_commutator
 from .orbitals import Orbitals, check_dm
-from .utils import compute_commutator
+from .utils import axpby, compute_commutator
 
 __all__ = ['ODASCFSolver', 'check_cubic']
 
 
+def cubic_coefficients(f0, f1, g0, g1):
+    """Return the coefficients of a cubic polynomial given its values and derivatives.
+
+    The polynomial a*x**3 + b*x**2 + c*x + d has the values f0 and f1 and the derivatives
+    g0 and g1 at the arguments 0 and 1. The coefficients are returned as (a, b, c, d).
+    """
+    d = f0
+    c = g0
+    a = g1 - 2 * f1 + c + 2 * d
+    b = f1 - a - c - d
+    return a, b, c, d
+
+
 def find_min_cubic(f0, f1, g0, g1):
     """Find the minimum of a cubic polynomial in the range [0,1]
 
@@ -46,10 +58,7 @@ def find_min_cubic(f0, f1, g0, g1):
             The derivative at argument 1
     """
     # coefficients of the polynomial a*x**3 + b*x**2 + c*x + d
-    d = f0
-    c = g0
-    a = g1 - 2 * f1 + c + 2 * d
-    b = f1 - a - c - d
+    a, b, c, d = cubic_coefficients(f0, f1, g0, g1)
 
     # find the roots of the derivative
     discriminant = b ** 2 - 3 * a * c  # simplified expression, not a mistake!
@@ -108,6 +117,14 @@ def find_min_quadratic(g0, g1):
 class ODASCFSolver:
     """Optimal damping SCF algorithm (with cubic interpolation)"""
     kind = 'dm'  # input/output variable is the density matrix
+    # For Hamiltonians that are quadratic in the density matrices, point 0 of an iteration
+    # is interpolated from the previous one, which carries rounding errors. Near
+    # convergence, the energy differences and derivatives in the cubic line search are of
+    # the order of error**2 and become comparable to these rounding errors. Point 0 is
+    # therefore rebuilt from the density matrices once the error drops below
+    # rebuild_ratio * threshold. With 1e4, HF/STO-3G, LiH (UHF) and water take as many
+    # iterations as when point 0 is rebuilt every time; 1e2 and 1e3 did not.
+    rebuild_ratio = 1e4
 
     def __init__(self, threshold=1e-8, maxiter=128, skip_energy=False, debug=False):
         """
@@ -168,18 +185,27 @@ class ODASCFSolver:
         fock0s = [np.zeros(overlap.shape) for i in range(ham.ndm)]
         fock1s = [np.zeros(overlap.shape) for i in range(ham.ndm)]
         dm1s = [np.zeros(overlap.shape) for i in range(ham.ndm)]
+        delta_dm = np.zeros(overlap.shape)
         orbs = [Orbitals(overlap.shape[0]) for i in range(ham.ndm)]
+        # When the energy is at most quadratic in the density matrices (e.g. Hartree-Fock),
+        # the mixed Fock matrices and the interpolated energy at the end of an iteration
+        # are exact, up to rounding errors. They are then reused as point 0 of the next
+        # iteration, which saves one Fock build per iteration. Near convergence, point 0
+        # is rebuilt from the density matrices again, see rebuild_ratio.
+        quadratic = ham.quadratic
+        rebuild = True
         converged = False
         counter = 0
         mixing = None
         error = None
         while self.maxiter is None or counter < self.maxiter:
-            # feed the latest density matrices in the hamiltonian
-            ham.reset(*dm0s)
-            # Construct the Fock operators in point 0
-            ham.compute_fock(*fock0s)
-            # Compute the energy in point 0
-            energy0 = ham.compute_energy()
+            if rebuild:
+                # feed the latest density matrices in the hamiltonian
+                ham.reset(*dm0s)
+                # Construct the Fock operators in point 0
+                ham.compute_fock(*fock0s)
+                # Compute the energy in point 0
+                energy0 = ham.compute_energy()
 
             if mixing is None:
                 print('5: %5i %20.13f' % (counter, energy0))
@@ -193,7 +219,7 @@ class ODASCFSolver:
             occ_model.assign(*orbs)
             # Construct the density matrices
             for i in range(ham.ndm):
-                dm1s[i][:] = orbs[i].to_dm()
+                orbs[i].to_dm(out=dm1s[i])
 
             # feed the latest density matrices in the hamiltonian
             ham.reset(*dm1s)
@@ -207,10 +233,9 @@ class ODASCFSolver:
             deriv0 = 0.0
             deriv1 = 0.0
             for i in range(ham.ndm):
-                deriv0 += np.einsum('ab,ab', fock0s[i], dm1s[i])
-                deriv0 -= np.einsum('ab,ab', fock0s[i], dm0s[i])
-                deriv1 += np.einsum('ab,ab', fock1s[i], dm1s[i])
-                deriv1 -= np.einsum('ab,ab', fock1s[i], dm0s[i])
+                np.subtract(dm1s[i], dm0s[i], out=delta_dm)
+                deriv0 += np.vdot(fock0s[i], delta_dm)
+                deriv1 += np.vdot(fock1s[i], delta_dm)
             deriv0 *= ham.deriv_scale
             deriv1 *= ham.deriv_scale
 
@@ -222,25 +247,31 @@ class ODASCFSolver:
             if self.debug:
                 check_cubic(ham, dm0s, dm1s, energy0, energy1, deriv0, deriv1)
 
+            if quadratic:
+                # The cubic polynomial is exact for a quadratic energy.
+                a, b, c, d = cubic_coefficients(energy0, energy1, deriv0, deriv1)
+                energy0 = ((a * mixing + b) * mixing + c) * mixing + d
+
             # compute the mixed density and fock matrices (in-place in dm0s and fock0s)
             for i in range(ham.ndm):
-                dm0s[i][:] *= 1 - mixing
-                dm0s[i][:] += dm1s[i] * mixing
-                fock0s[i][:] *= 1 - mixing
-                fock0s[i][:] += fock1s[i] * mixing
+                axpby(mixing, dm1s[i], 1 - mixing, dm0s[i])
+                axpby(mixing, fock1s[i], 1 - mixing, fock0s[i])
 
             # Compute the convergence criterion.
             errorsq = 0.0
             for i in range(ham.ndm):
                 commutator = compute_commutator(dm0s[i], fock0s[i], overlap)
-                errorsq += np.einsum('ab,ab', commutator, commutator)
+                errorsq += np.vdot(commutator, commutator)
             error = errorsq ** 0.5
             if error < self.threshold:
                 converged = True
                 break
-            elif mixing == 0.0:
+            elif mixing == 0.0 and rebuild:
                 raise NoSCFConvergence(
                     'The ODA algorithm made a zero step without reaching convergence.')
+            # After a zero step with an interpolated point 0, rebuild it and try once more.
+            rebuild = (not quadratic or mixing == 0.0 or
+                       error < self.rebuild_ratio * self.threshold)
 
             # counter
             counter += 1
@@ -298,25 +329,25 @@ def check_cubic(ham, dm0s, dm1s, e0, e1, g0, g1, do_plot=True):
        implementation of Fock matrices.
     """
     # coefficients of the polynomial a*x**3 + b*x**2 + c*x + d
-    d = e0
-    c = g0
-    a = g1 - 2 * e1 + c + 2 * d
-    b = e1 - a - c - d
+    a, b, c, d = cubic_coefficients(e0, e1, g0, g1)
 
     ndm = len(dm0s)
     assert ndm == len(dm1s)
     dm2s = [np.zeros(dm1.shape) for dm1 in dm1s]
+    delta_dms = [dm1 - dm0 for dm0, dm1 in zip(dm0s, dm1s)]
     xs = np.array([0.001, 0.002, 0.003, 0.004, 0.005, 0.995, 0.996, 0.997, 0.998, 0.999])
     energies = []
     for x in xs:
         for i in range(ndm):
-            dm2s[i][:] = dm0s[i] * (1 - x) + dm1s[i] * x
+            np.multiply(delta_dms[i], x, out=dm2s[i])
+            dm2s[i] += dm0s[i]
         ham.reset(*dm2s)
         e2 = ham.compute_energy()
         energies.append(e2)
     energies = np.array(energies)
 
     if do_plot:
+        import matplotlib.pyplot as pt
         # make a nice figure
         xxs = np.concatenate([np.linspace(0, 0.006, 60), np.linspace(0.994, 1.0, 60)])
         poly = a * xxs ** 3 + b * xxs ** 2 + c * xxs + d
@@ -19,13 +19,11 @@
 #
 # --
 from contextlib import contextmanager
+from functools import lru_cache
 from os import path
 
-import matplotlib.pyplot as pt
 import numpy as np
 import pkg_resources
-from gbasis import GOBasis
-from old_grids.grid.molgrid import BeckeMolGrid
 
 from . import gobasis_data
 from . import mol_data as mdata
@@ -51,28 +49,31 @@ __all__ = [
 ]
 
 
+def _trace_prod(op1, op2):
+    """Return the trace of the product of two square matrices, using a flat dot product.
+
+    When stacks of matrices, with shape (ndm, nbasis, nbasis), are given, the sum of the
+    traces of all products is returned.
+    """
+    return op1.ravel().dot(np.swapaxes(op2, -1, -2).ravel())
+
+
 def check_cubic_wrapper(ham, dm0s, dm1s, do_plot=False):
-    focks = [np.zeros(dm0.shape) for dm0 in dm0s]
+    focks = np.zeros((ham.ndm,) + dm0s[0].shape)
+    # The derivatives at both ends are taken along the same direction.
+    delta_dms = np.array(dm1s) - np.array(dm0s)
 
     # evaluate stuff at dm0
     ham.reset(*dm0s)
     e0 = ham.compute_energy()
     ham.compute_fock(*focks)
-    g0 = 0.0
-    for i in range(ham.ndm):
-        g0 += np.einsum('ab,ba', focks[i], dm1s[i])
-        g0 -= np.einsum('ab,ba', focks[i], dm0s[i])
-    g0 *= ham.deriv_scale
+    g0 = _trace_prod(focks, delta_dms) * ham.deriv_scale
 
     # evaluate stuff at dm1
     ham.reset(*dm1s)
     e1 = ham.compute_energy()
     ham.compute_fock(*focks)
-    g1 = 0.0
-    for i in range(ham.ndm):
-        g1 += np.einsum('ab,ba', focks[i], dm1s[i])
-        g1 -= np.einsum('ab,ba', focks[i], dm0s[i])
-    g1 *= ham.deriv_scale
+    g1 = _trace_prod(focks, delta_dms) * ham.deriv_scale
 
     check_cubic(ham, dm0s, dm1s, e0, e1, g0, g1, do_plot)
 
@@ -84,7 +85,7 @@ def check_interpolation(ham, olp, kin, na, orbs, do_plot=False):
     check_cubic_wrapper(ham, dm0s, dm1s, do_plot)
 
 
-def check_dot_hessian(ham, *dms0):
+def check_dot_hessian(ham, *dms0, seed=None):
     """Test dot_hessian implementation with finite differences.
 
     This test is comparable to ``check_delta`` but is a little simpler to use. The small
@@ -103,6 +104,8 @@ def check_dot_hessian(ham, *dms0):
         differences. In the case of a restricted effective Hamiltonian, this is just the
         alpha density matrix. In the case of an unrestricted effective Hamiltonian, these
         are the alpha and beta density matrix.
+    seed : int
+        Seed for the random displacements. When not given, fresh entropy is used.
     """
     assert ham.ndm == len(dms0)
     nbasis = dms0[0].shape[0]
@@ -118,10 +121,21 @@ def check_dot_hessian(ham, *dms0):
     focks1 = [np.zeros((nbasis, nbasis)) for _i in range(ham.ndm)]
     dots0 = [np.zeros((nbasis, nbasis)) for _i in range(ham.ndm)]
     dots1 = [np.zeros((nbasis, nbasis)) for _i in range(ham.ndm)]
+    # All displacements are generated at once. Single precision is sufficient for random
+    # noise: the same (exactly representable) values are used for the finite difference and
+    # for the Hessian dot product, which both work in double precision.
+    all_delta_dms = np.random.default_rng(seed).standard_normal(
+        (nrep, ham.ndm, nbasis, nbasis), dtype=np.float32)
+    all_delta_dms *= np.float32(eps)
+    # Differences between Fock matrices and their products with the reference DMs, stacked
+    # for all density matrices, such that each squared norm is a single flat dot product.
+    stacked_dms0 = np.array(dms0)
+    tmps = np.zeros((ham.ndm, nbasis, nbasis))
+    prods = np.zeros((ham.ndm, nbasis, nbasis))
     for irep in range(nrep):
-        delta_dms = [np.random.normal(0, eps, (nbasis, nbasis)) for _i in range(ham.ndm)]
+        delta_dms = all_delta_dms[irep]
         for idm in range(ham.ndm):
-            dms1[idm] = dms0[idm] + delta_dms[idm]
+            np.add(dms0[idm], delta_dms[idm], out=dms1[idm])
         ham.reset(*dms0)
         ham.reset_delta(*delta_dms)
         ham.compute_dot_hessian(*dots0)
@@ -131,16 +145,15 @@ def check_dot_hessian(ham, *dms0):
         ham.compute_fock(*focks1)
         ham.compute_dot_hessian(*dots1)
 
-        diffsq = 0.0
-        errorsq = 0.0
         for idm in range(ham.ndm):
-            tmp1 = focks0[idm] - focks1[idm]
-            tmp2 = np.dot(tmp1, dms0[idm])
-            diffsq += np.einsum('ab,ab', tmp2, tmp2)
-            tmp1 += (0.5 * ham.deriv_scale) * dots0[idm]
-            tmp1 += (0.5 * ham.deriv_scale) * dots1[idm]
-            tmp2 = np.dot(tmp1, dms0[idm])
-            errorsq += np.einsum('ab,ab', tmp2, tmp2)
+            np.subtract(focks0[idm], focks1[idm], out=tmps[idm])
+        np.matmul(tmps, stacked_dms0, out=prods)
+        diffsq = prods.ravel().dot(prods.ravel())
+        for idm in range(ham.ndm):
+            tmps[idm] += (0.5 * ham.deriv_scale) * dots0[idm]
+            tmps[idm] += (0.5 * ham.deriv_scale) * dots1[idm]
+        np.matmul(tmps, stacked_dms0, out=prods)
+        errorsq = prods.ravel().dot(prods.ravel())
         diffs[irep] = diffsq ** 0.5
         errors[irep] = errorsq ** 0.5
 
@@ -196,49 +209,36 @@ def check_dot_hessian_polynomial(olp, core, ham, orbs, is_hf=True, extent=1.0,
         """Check quadratic energy model between two dms."""
         ham.reset(*dms_a)
         energy_a_0 = ham.compute_energy()
-        focks_a = [np.zeros(dm_a.shape) for dm_a in dms_a]
+        # All matrices are stacked with shape (ndm, nbasis, nbasis).
+        stacked_dms_a = np.array(dms_a)
+        stacked_dms_b = np.array(dms_b)
+        focks_a = np.zeros(stacked_dms_a.shape)
         ham.compute_fock(*focks_a)
 
-        delta_dms = []
-        for idm in range(ham.ndm):
-            delta_dms.append(dms_b[idm] - dms_a[idm])
+        delta_dms = stacked_dms_b - stacked_dms_a
         ham.reset_delta(*delta_dms)
-        dots_a = [np.zeros(dm_a.shape) for dm_a in dms_a]
+        dots_a = np.zeros(stacked_dms_a.shape)
         ham.compute_dot_hessian(*dots_a)
 
-        energy_a_1 = 0.0
-        energy_a_2 = 0.0
-        for idm in range(ham.ndm):
-            energy_a_1 += np.einsum('ab,ba', focks_a[idm], delta_dms[idm]) * ham.deriv_scale
-            energy_a_2 += np.einsum('ab,ba', dots_a[idm], delta_dms[idm]) * ham.deriv_scale ** 2
-
-        # print 'energy_a_0', energy_a_0
-        # print 'energy_a_1', energy_a_1
-        # print 'energy_a_2', energy_a_2
+        energy_a_1 = _trace_prod(focks_a, delta_dms) * ham.deriv_scale
+        energy_a_2 = _trace_prod(dots_a, delta_dms) * ham.deriv_scale ** 2
 
         # Compute interpolation and compare
         energies_x = np.zeros(npoint)
-        energies_2nd_order = np.zeros(npoint)
+        energies_2nd_order = energy_a_0 + xs * energy_a_1 + 0.5 * xs * xs * energy_a_2
         derivs_x = np.zeros(npoint)
-        derivs_2nd_order = np.zeros(npoint)
+        derivs_2nd_order = energy_a_1 + xs * energy_a_2
+        # Interpolated density matrices at all points, shape=(npoint, ndm, nbasis, nbasis)
+        all_dms_x = np.multiply.outer(1 - xs, stacked_dms_a) + \
+            np.multiply.outer(xs, stacked_dms_b)
         for ipoint in range(npoint):
-            x = xs[ipoint]
-            dms_x = []
-            for idm in range(ham.ndm):
-                dm_x = dms_a[idm] * (1 - x) + dms_b[idm] * x
-                dms_x.append(dm_x)
-            ham.reset(*dms_x)
+            ham.reset(*all_dms_x[ipoint])
             energies_x[ipoint] = ham.compute_energy()
             ham.compute_fock(*focks_a)
-            for idm in range(ham.ndm):
-                derivs_x[ipoint] += np.einsum('ab,ba', focks_a[idm], delta_dms[idm]) * \
-                                    ham.deriv_scale
-
-            energies_2nd_order[ipoint] = energy_a_0 + x * energy_a_1 + 0.5 * x * x * energy_a_2
-            derivs_2nd_order[ipoint] = energy_a_1 + x * energy_a_2
-            # print '%5.2f %15.8f %15.8f' % (x, energies_x[ipoint], energies_2nd_order[ipoint])
+            derivs_x[ipoint] = _trace_prod(focks_a, delta_dms) * ham.deriv_scale
 
         if do_plot:  # pragma: no cover
+            import matplotlib.pyplot as pt
             pt.clf()
             pt.plot(xs, energies_x, 'ro')
             pt.plot(xs, energies_2nd_order, 'k-')
@@ -408,9 +408,7 @@ def check_lih_os_hf(scf_solver):
 
 def check_co_cs_pbe(scf_solver):
     fname = 'co_pbe_sto3g_fchk'
-    mdata = load_mdata(fname)
-    grid = BeckeMolGrid(mdata['coordinates'], mdata['numbers'], mdata['pseudo_numbers'], 'fine',
-                        random_rotate=False)
+    grid = get_grid(fname, 'fine')
     olp = load_olp(fname)
     kin = load_kin(fname)
     na = load_na(fname)
@@ -459,9 +457,7 @@ def check_co_cs_pbe(scf_solver):
 
 def check_h3_os_pbe(scf_solver):
     fname = 'h3_pbe_321g_fchk'
-    mdata = load_mdata(fname)
-    grid = BeckeMolGrid(mdata['coordinates'], mdata['numbers'], mdata['pseudo_numbers'], 'veryfine',
-                        random_rotate=False)
+    grid = get_grid(fname, 'veryfine')
     olp = load_olp(fname)
     kin = load_kin(fname)
     na = load_na(fname)
@@ -563,9 +559,7 @@ def check_water_cs_m05(scf_solver):
                  A configured SCF solver that must be tested.
     """
     fname = 'water_m05_321g_fchk'
-    mdata = load_mdata(fname)
-    grid = BeckeMolGrid(mdata['coordinates'], mdata['numbers'], mdata['pseudo_numbers'], 'fine',
-                        random_rotate=False)
+    grid = get_grid(fname, 'fine')
     olp = load_olp(fname)
     kin = load_kin(fname)
     na = load_na(fname)
@@ -621,9 +615,7 @@ def check_methyl_os_tpss(scf_solver):
                  A configured SCF solver that must be tested.
     """
     fname = 'methyl_tpss_321g_fchk'
-    mdata = load_mdata(fname)
-    grid = BeckeMolGrid(mdata['coordinates'], mdata['numbers'], mdata['pseudo_numbers'], 'fine',
-                        random_rotate=False)
+    grid = get_grid(fname, 'fine')
     olp = load_olp(fname)
     kin = load_kin(fname)
     na = load_na(fname)
@@ -674,9 +666,17 @@ def check_methyl_os_tpss(scf_solver):
     assert abs(ham.cache['energy_nn'] - 9.0797839705) < 1e-5
 
 
+@lru_cache(maxsize=None)
 def _compose_fn(subpath, fn, ext=".npy"):
+    # Each file is read only once. The result is shared by all callers and therefore
+    # read-only: callers that need to modify it must make a copy. Files already stored in
+    # double precision are memory-mapped, such that only the pages in use are loaded.
     pth = pkg_resources.resource_filename(f"meanfield.test.data.{fn}", f"{subpath}{ext}")
-    return np.load(pth).astype(np.float64)
+    result = np.asarray(np.load(pth, mmap_mode='r'))
+    if result.dtype != np.float64:
+        result = result.astype(np.float64)
+        result.setflags(write=False)
+    return result
 
 
 def load_json(fn):
@@ -782,11 +782,22 @@ def load_mdata(fn):
     return getattr(mdata, fn)
 
 
+@lru_cache(maxsize=None)
 def get_obasis(fn):
+    from gbasis import GOBasis
     params = getattr(gobasis_data, fn)
     return GOBasis(*params)
 
 
+@lru_cache(maxsize=None)
+def get_grid(fn, *args):
+    from old_grids.grid.molgrid import BeckeMolGrid
+    # Without random rotations, the grid only depends on the arguments and can be reused.
+    mdata = load_mdata(fn)
+    return BeckeMolGrid(mdata['coordinates'], mdata['numbers'], mdata['pseudo_numbers'], *args,
+                        random_rotate=False)
+
+
 @contextmanager
 def numpy_seed(seed=1):
     """Temporarily set NumPy's random seed to a given number.
@@ -235,6 +235,24 @@ def test_dealloc():
     assert len(c._store) == 0
 
 
+def test_dealloc_large():
+    c = Cache(max_reuse_nbytes=400)
+    ar1, new = c.load('small', alloc=(5, 10))
+    ar2, new = c.load('large', alloc=(10, 10))
+    c.clear()
+    assert 'small' not in c
+    assert 'large' not in c
+    # Only the small array is kept for reuse.
+    assert len(c._store) == 1
+    assert c.load('small', alloc=(5, 10))[0] is ar1
+    assert c.load('large', alloc=(10, 10))[0] is not ar2
+    # Without a threshold, all arrays are kept.
+    c = Cache(max_reuse_nbytes=None)
+    ar2, new = c.load('large', alloc=(10, 10))
+    c.clear_item('large')
+    assert c.load('large', alloc=(10, 10))[0] is ar2
+
+
 def test_dump_unpack():
     c = Cache()
     c.dump(('foo',), 5)
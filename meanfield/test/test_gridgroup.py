@@ -22,8 +22,7 @@
 
 from nose.tools import assert_raises
 
-from old_grids.grid import BeckeMolGrid
-from .common import get_obasis, load_mdata, load_orbs_alpha
+from .common import get_obasis, get_grid, load_orbs_alpha
 from .. import RGridGroup, RLibXCMGGA, UGridGroup
 from ..cache import Cache
 
@@ -33,9 +32,7 @@ faulthandler.enable()
 def test_gridgroup_density_cutoff():
     # prepare some molecule
     fname = 'co_pbe_sto3g_fchk'
-    mdata = load_mdata(fname)
-    grid = BeckeMolGrid(mdata['coordinates'], mdata['numbers'], mdata['pseudo_numbers'],
-                        random_rotate=False)
+    grid = get_grid(fname)
 
     # make and populate a fake cache object (normally done by the effective
     # hamiltonian)
@@ -59,9 +56,7 @@ def test_gridgroup_density_cutoff():
 def test_gridgroup_exceptions():
     # prepare some molecule
     fname = 'co_pbe_sto3g_fchk'
-    mdata = load_mdata(fname)
-    grid = BeckeMolGrid(mdata['coordinates'], mdata['numbers'], mdata['pseudo_numbers'],
-                        random_rotate=False)
+    grid = get_grid(fname)
 
     # make and populate a fake cache object (normally done by the effective
     # hamiltonian)
@@ -19,12 +19,13 @@
 #
 # --
 
+import numpy as np
 
 from .common import helper_compute, load_mdata, load_kin, load_na, load_er, \
     load_nn, load_orbs_alpha, load_orbs_beta, get_obasis, load_olp
 from .. import UTwoIndexTerm, UDirectTerm, UExchangeTerm, UEffHam, RTwoIndexTerm, RDirectTerm, \
     REffHam, RExchangeTerm, PlainSCFSolver, AufbauOccModel, \
-    convergence_error_eigen
+    convergence_error_eigen, Observable
 
 
 def test_energy_hydrogen():
@@ -45,6 +46,68 @@ def test_energy_hydrogen():
     assert abs(ham.cache['energy'] - -4.665818503844346E-01) < 1e-8
 
 
+def test_fock_linear_terms():
+    fname = 'h_sto3g_fchk'
+    kin = load_kin(fname)
+    na = load_na(fname)
+    er = load_er(fname)
+    terms = [
+        UTwoIndexTerm(kin, 'kin'),
+        UDirectTerm(er, 'hartree'),
+        UExchangeTerm(er, 'x_hf'),
+        UTwoIndexTerm(na, 'ne'),
+    ]
+    ham = UEffHam(terms)
+    orb_alpha = load_orbs_alpha(fname)
+    orb_beta = load_orbs_beta(fname)
+    # The summed Fock contribution of the linear terms is reused, so the Fock
+    # matrices must remain correct for different density matrices.
+    for orbs in (orb_alpha, orb_beta), (orb_beta, orb_alpha), (orb_alpha, orb_alpha):
+        focks = helper_compute(ham, *orbs)[1]
+        expected = [np.zeros(fock.shape) for fock in focks]
+        for term in terms:
+            term.add_fock(ham.cache, *expected)
+        for fock, fock_expected in zip(focks, expected):
+            np.testing.assert_allclose(fock, fock_expected, atol=1e-12)
+
+
+def test_fock_linear_terms_invalidate():
+    fname = 'h_sto3g_fchk'
+    kin = load_kin(fname)
+    na = load_na(fname)
+    er = load_er(fname)
+    ham = REffHam([RTwoIndexTerm(kin.copy(), 'kin'), RDirectTerm(er, 'hartree')])
+    orb_alpha = load_orbs_alpha(fname)
+    helper_compute(ham, orb_alpha)
+
+    def check_fock():
+        fock = helper_compute(ham, orb_alpha)[1][0]
+        expected = np.zeros(fock.shape)
+        for term in ham.terms:
+            term.add_fock(ham.cache, expected)
+        np.testing.assert_allclose(fock, expected, atol=1e-12)
+
+    # Modify the operator of a linear term in place.
+    ham.terms[0].op_alpha[:] += na
+    ham.invalidate()
+    check_fock()
+    # Assign new terms.
+    ham.terms = ham.terms + (RTwoIndexTerm(na, 'ne'),)
+    check_fock()
+    assert 'energy_ne' in ham.cache
+
+
+def test_quadratic():
+    fname = 'h_sto3g_fchk'
+    kin = load_kin(fname)
+    er = load_er(fname)
+    ham = REffHam([RTwoIndexTerm(kin, 'kin'), RDirectTerm(er, 'hartree'),
+                   RExchangeTerm(er, 'x_hf')])
+    assert ham.quadratic
+    ham = REffHam([RTwoIndexTerm(kin, 'kin'), Observable('other')])
+    assert not ham.quadratic
+
+
 def test_perturbation():
     fname = 'n2_hfs_sto3g_fchk'
     scf_solver = PlainSCFSolver(maxiter=1024)
@@ -23,10 +23,9 @@
 from nose.plugins.skip import SkipTest
 from nose.tools import assert_raises
 
-from old_grids.grid import BeckeMolGrid
 from .common import check_interpolation, \
     check_dot_hessian, check_dot_hessian_polynomial, check_dot_hessian_cache, load_olp, load_kin, \
-    load_na, get_obasis, load_mdata, load_orbs_alpha, load_orbsa_dms, load_orbs_beta, \
+    load_na, get_obasis, get_grid, load_orbs_alpha, load_orbsa_dms, load_orbs_beta, \
     load_orbsb_dms, load_er
 from .. import RGridGroup, RLibXCGGA, REffHam, RLibXCLDA, RLibXCHybridGGA, UGridGroup, ULibXCGGA, \
     RLibXCMGGA, UEffHam, ULibXCLDA, ULibXCHybridGGA, UExchangeTerm, ULibXCMGGA, RLibXCWrapper, \
@@ -36,12 +35,10 @@ from .. import RGridGroup, RLibXCGGA, REffHam, RLibXCLDA, RLibXCHybridGGA, UGrid
 def setup_gga_cs(name):
     """Prepare data structures for R-GGA calculation in CO."""
     fname = 'co_pbe_sto3g_fchk'
-    mdata = load_mdata(fname)
     dm_alpha = load_orbsa_dms(fname)
     orb_alpha = load_orbs_alpha(fname)
 
-    grid = BeckeMolGrid(mdata['coordinates'], mdata['numbers'], mdata['pseudo_numbers'],
-                        random_rotate=False)
+    grid = get_grid(fname)
     olp = load_olp(fname)
     kin = load_kin(fname)
     na = load_na(fname)
@@ -97,12 +94,10 @@ def test_dot_hessian_x_pbe_cs_cache():
 def setup_hfs_cs():
     """Prepare data structures for R-HFS (x-functional-only) calculation on CO."""
     fname = 'co_pbe_sto3g_fchk'
-    mdata = load_mdata(fname)
     dm_alpha = load_orbsa_dms(fname)
     orb_alpha = load_orbs_alpha(fname)
 
-    grid = BeckeMolGrid(mdata['coordinates'], mdata['numbers'], mdata['pseudo_numbers'],
-                        'coarse', random_rotate=False)
+    grid = get_grid(fname, 'coarse')
     olp = load_olp(fname)
     kin = load_kin(fname)
     na = load_na(fname)
@@ -140,12 +135,10 @@ def setup_x_pbe_c_vwn_cs():
     """Setup data structure for mixed GGA+LDA calculation."""
     # mixing of GGA and LDA
     fname = 'water_hfs_321g_fchk'
-    mdata = load_mdata(fname)
     dm_alpha = load_orbsa_dms(fname)
     orb_alpha = load_orbs_alpha(fname)
 
-    grid = BeckeMolGrid(mdata['coordinates'], mdata['numbers'], mdata['pseudo_numbers'],
-                        random_rotate=False)
+    grid = get_grid(fname)
     olp = load_olp(fname)
     kin = load_kin(fname)
     na = load_na(fname)
@@ -182,12 +175,10 @@ def test_dot_hessian_x_pbe_c_vwn_cs_cache():
 def setup_c_vwn_cs():
     """Prepare data structures for R-VWN (c-functional-only) calculation on water."""
     fname = 'water_hfs_321g_fchk'
-    mdata = load_mdata(fname)
     dm_alpha = load_orbsa_dms(fname)
     orb_alpha = load_orbs_alpha(fname)
 
-    grid = BeckeMolGrid(mdata['coordinates'], mdata['numbers'], mdata['pseudo_numbers'],
-                        random_rotate=False)
+    grid = get_grid(fname)
     olp = load_olp(fname)
     kin = load_kin(fname)
     na = load_na(fname)
@@ -223,12 +214,10 @@ def test_dot_hessian_c_vwn_cs_cache():
 def setup_o3lyp_cs():
     """Prepare data structures for R-O3LYP (xc-functional-only) calculation on water."""
     fname = 'water_hfs_321g_fchk'
-    mdata = load_mdata(fname)
     dm_alpha = load_orbsa_dms(fname)
     orb_alpha = load_orbs_alpha(fname)
 
-    grid = BeckeMolGrid(mdata['coordinates'], mdata['numbers'], mdata['pseudo_numbers'],
-                        random_rotate=False)
+    grid = get_grid(fname)
     olp = load_olp(fname)
     kin = load_kin(fname)
     na = load_na(fname)
@@ -263,10 +252,8 @@ def test_dot_hessian_o3lyp_cs_cache():
 
 def test_cubic_interpolation_x_tpss_cs():
     fname = 'water_hfs_321g_fchk'
-    mdata = load_mdata(fname)
 
-    grid = BeckeMolGrid(mdata['coordinates'], mdata['numbers'], mdata['pseudo_numbers'],
-                        random_rotate=False)
+    grid = get_grid(fname)
     olp = load_olp(fname)
     kin = load_kin(fname)
     na = load_na(fname)
@@ -279,10 +266,8 @@ def test_cubic_interpolation_x_tpss_cs():
 
 def test_cubic_interpolation_c_pbe_os():
     fname = 'h3_pbe_321g_fchk'
-    mdata = load_mdata(fname)
 
-    grid = BeckeMolGrid(mdata['coordinates'], mdata['numbers'], mdata['pseudo_numbers'],
-                        random_rotate=False)
+    grid = get_grid(fname)
     olp = load_olp(fname)
     kin = load_kin(fname)
     na = load_na(fname)
@@ -297,10 +282,8 @@ def test_cubic_interpolation_c_pbe_os():
 
 def test_cubic_interpolation_x_pbe_os():
     fname = 'h3_pbe_321g_fchk'
-    mdata = load_mdata(fname)
 
-    grid = BeckeMolGrid(mdata['coordinates'], mdata['numbers'], mdata['pseudo_numbers'],
-                        random_rotate=False)
+    grid = get_grid(fname)
     olp = load_olp(fname)
     kin = load_kin(fname)
     na = load_na(fname)
@@ -316,13 +299,11 @@ def test_cubic_interpolation_x_pbe_os():
 def setup_hfs_os():
     """Prepare data structures for U_HFS (x-functional-only) calculation in H3 radical."""
     fname = 'h3_hfs_321g_fchk'
-    mdata = load_mdata(fname)
     dm_alpha = load_orbsa_dms(fname)
     dm_beta = load_orbsb_dms(fname)
     orb_alpha = load_orbs_alpha(fname)
     orb_beta = load_orbs_beta(fname)
-    grid = BeckeMolGrid(mdata['coordinates'], mdata['numbers'], mdata['pseudo_numbers'],
-                        random_rotate=False)
+    grid = get_grid(fname)
     olp = load_olp(fname)
     kin = load_kin(fname)
     na = load_na(fname)
@@ -343,10 +324,8 @@ def test_cubic_interpolation_hfs_os():
 def test_cubic_interpolation_x_pbe_c_vwn_os():
     # mixing of LDA and GGA
     fname = 'h3_hfs_321g_fchk'
-    mdata = load_mdata(fname)
 
-    grid = BeckeMolGrid(mdata['coordinates'], mdata['numbers'], mdata['pseudo_numbers'],
-                        random_rotate=False)
+    grid = get_grid(fname)
     olp = load_olp(fname)
     kin = load_kin(fname)
     na = load_na(fname)
@@ -362,10 +341,8 @@ def test_cubic_interpolation_x_pbe_c_vwn_os():
 
 def test_cubic_interpolation_o3lyp_os():
     fname = 'h3_hfs_321g_fchk'
-    mdata = load_mdata(fname)
 
-    grid = BeckeMolGrid(mdata['coordinates'], mdata['numbers'], mdata['pseudo_numbers'],
-                        random_rotate=False)
+    grid = get_grid(fname)
     olp = load_olp(fname)
     kin = load_kin(fname)
     na = load_na(fname)
@@ -382,10 +359,8 @@ def test_cubic_interpolation_o3lyp_os():
 def test_cubic_interpolation_x_tpss_os():
     # mixing of LDA and GGA
     fname = 'h3_hfs_321g_fchk'
-    mdata = load_mdata(fname)
 
-    grid = BeckeMolGrid(mdata['coordinates'], mdata['numbers'], mdata['pseudo_numbers'],
-                        random_rotate=False)
+    grid = get_grid(fname)
     olp = load_olp(fname)
     kin = load_kin(fname)
     na = load_na(fname)
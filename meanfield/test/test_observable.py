@@ -20,12 +20,15 @@
 # --
 """Unit tests for horton/meanfield/observable.py."""
 
+import numpy as np
+
 from .common import check_dot_hessian, \
     check_dot_hessian_polynomial, check_dot_hessian_cache, load_orbsa_dms, load_orbsb_dms, \
     load_olp, load_kin, load_na, load_er, load_er_chol, load_orbs_alpha, load_orbs_beta
 
 from .. import RTwoIndexTerm, RDirectTerm, RExchangeTerm, REffHam, UTwoIndexTerm, UDirectTerm, \
-    UExchangeTerm, UEffHam
+    UExchangeTerm, UEffHam, RJKTerm
+from ..observable import contract_exchange, contract_exchange_pair
 
 
 def setup_rhf_case(cholesky=False):
@@ -36,8 +39,7 @@ def setup_rhf_case(cholesky=False):
 
     # RHF Effective Hamiltonian
     olp = load_olp(fname)
-    core = load_kin(fname)
-    core += load_na(fname)
+    core = load_kin(fname) + load_na(fname)
     if cholesky:
         er = load_er_chol(fname)
     else:
@@ -82,6 +84,36 @@ def test_cache_dot_hessian_rhf_cholesky():
     check_dot_hessian_cache(ham, dma)
 
 
+def check_jk_rhf(cholesky):
+    """Compare RJKTerm with separate direct and exchange terms."""
+    dma, olp, core, ham, orb_alpha = setup_rhf_case(cholesky)
+    er = ham.terms[1].op_alpha
+    ham_jk = REffHam([RTwoIndexTerm(core, 'core'), RJKTerm(er, 'hf', 0.7)])
+    ham_sep = REffHam([RTwoIndexTerm(core, 'core'), RDirectTerm(er, 'hartree'),
+                       RExchangeTerm(er, 'x_hf', 0.7)])
+    results = []
+    for ham in ham_jk, ham_sep:
+        ham.reset(dma)
+        energy = ham.compute_energy()
+        fock = np.zeros(dma.shape)
+        ham.compute_fock(fock)
+        ham.reset_delta(fock)
+        dot = np.zeros(dma.shape)
+        ham.compute_dot_hessian(dot)
+        results.append((energy, fock, dot))
+    for result_jk, result_sep in zip(*results):
+        np.testing.assert_allclose(result_jk, result_sep, rtol=1e-12, atol=1e-12)
+    check_dot_hessian(ham_jk, dma)
+
+
+def test_jk_rhf():
+    check_jk_rhf(False)
+
+
+def test_jk_rhf_cholesky():
+    check_jk_rhf(True)
+
+
 def setup_uhf_case():
     """Prepare data structures for UHF calculation."""
     fname = 'h3_hfs_321g_fchk'
@@ -93,8 +125,7 @@ def setup_uhf_case():
 
     # UHF Effective Hamiltonian
     olp = load_olp(fname)
-    core = load_kin(fname)
-    core += load_na(fname)
+    core = load_kin(fname) + load_na(fname)
     er = load_er(fname)
     terms = [
         UTwoIndexTerm(core, 'core'),
@@ -119,3 +150,11 @@ def test_dot_hessian_uhf_fd():
 def test_cache_dot_hessian_uhf():
     dma, dmb, olp, core, ham, orb_alpha, orb_beta = setup_uhf_case()
     check_dot_hessian_cache(ham, dma, dmb)
+
+
+def test_exchange_pair_uhf():
+    dma, dmb, olp, core, ham, orb_alpha, orb_beta = setup_uhf_case()
+    er = ham.terms[2].op_alpha
+    exchange_alpha, exchange_beta = contract_exchange_pair(er, dma, dmb)
+    np.testing.assert_allclose(exchange_alpha, contract_exchange(er, dma), atol=1e-12)
+    np.testing.assert_allclose(exchange_beta, contract_exchange(er, dmb), atol=1e-12)
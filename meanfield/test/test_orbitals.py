@@ -162,6 +162,9 @@ def test_orbitals_check_orthonormality():
     orb.occupations[0] = 0.0
     orb.occupations[-1] = 1.0
     orb.check_orthonormality(olp)
+    orb.coeffs[:, 1] += 0.1 * orb.coeffs[:, 4]
+    with assert_raises(AssertionError):
+        orb.check_orthonormality(olp)
 
 
 def test_orbitals_error_eigen():
@@ -298,6 +301,18 @@ def test_orbitals_to_dm3():
     assert (dm != dm.T).any()
 
 
+def test_orbitals_to_dm_out():
+    fname = 'ch3_hf_sto3g_fchk'
+    orb_alpha = load_orbs_alpha(fname)
+    orb_beta = load_orbs_beta(fname)
+    out = np.zeros((orb_alpha.nbasis, orb_alpha.nbasis))
+    result = orb_alpha.to_dm(out=out)
+    assert result is out
+    np.testing.assert_equal(out, orb_alpha.to_dm())
+    orb_alpha.to_dm(other=orb_beta, out=out)
+    np.testing.assert_equal(out, orb_alpha.to_dm(other=orb_beta))
+
+
 def test_orbitals_rotate_random():
     orb0, olp = get_random_orbitals(5)
     orb0.check_normalization(olp)
@@ -37,6 +37,12 @@ def test_hf_cs_hf():
     check_hf_cs_hf(ODASCFSolver(threshold=1e-7))
 
 
+def test_hf_cs_hf_tight():
+    # The reuse of the interpolated Fock matrices must not spoil convergence at
+    # tight thresholds.
+    check_hf_cs_hf(ODASCFSolver(threshold=1e-8))
+
+
 def test_lih_os_hf():
     check_lih_os_hf(ODASCFSolver(threshold=1e-7))
 
@@ -24,7 +24,7 @@ from nose.plugins.skip import SkipTest
 
 from .common import load_olp, load_orbs_alpha, load_orbs_beta
 from ..moments import get_ncart_cumul, get_cartesian_powers
-from ..utils import get_spin, get_homo_lumo, get_level_shift
+from ..utils import get_spin, get_homo_lumo, get_level_shift, axpby, compute_commutator
 
 
 def check_spin(fname, sz0, ssq0, eps):
@@ -133,5 +133,26 @@ def test_get_cartesian_powers():
         assert (tmp == cartesian_powers[:len(tmp)]).all()
 
 
+def test_axpby():
+    rng = np.random.RandomState(1)
+    x = rng.normal(0, 1, (5, 5))
+    y0 = rng.normal(0, 1, (5, 5))
+    # contiguous arrays (BLAS)
+    y = y0.copy()
+    assert axpby(0.3, x, 0.7, y) is y
+    np.testing.assert_allclose(y, 0.3 * x + 0.7 * y0)
+    # strided arrays (fallback)
+    y = y0.copy()
+    axpby(0.3, x.T, 1.0, y[:, ::-1])
+    np.testing.assert_allclose(y[:, ::-1], 0.3 * x.T + y0[:, ::-1])
+
+
+def test_compute_commutator():
+    rng = np.random.RandomState(1)
+    dm, fock, overlap = [a + a.T for a in rng.normal(0, 1, (3, 5, 5))]
+    expected = np.dot(overlap, np.dot(dm, fock)) - np.dot(fock, np.dot(dm, overlap))
+    np.testing.assert_allclose(compute_commutator(dm, fock, overlap), expected, atol=1e-12)
+
+
 def test_rotate_cartesian_moments():
     raise SkipTest("Need a rotate cartesian moment test")
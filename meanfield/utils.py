@@ -21,6 +21,7 @@
 """Utility functions"""
 
 import numpy as np
+from scipy.linalg.blas import daxpy, dscal
 
 __all__ = [
     'get_level_shift', 'get_spin', 'get_homo_lumo',
@@ -62,16 +63,11 @@ def get_spin(orb_alpha, orb_beta, overlap):
     nalpha = orb_alpha.occupations.sum()
     nbeta = orb_beta.occupations.sum()
     sz = (nalpha - nbeta) / 2
-    correction = 0.0
-    for ialpha in range(orb_alpha.nfn):
-        if orb_alpha.occupations[ialpha] == 0.0:
-            continue
-        for ibeta in range(orb_beta.nfn):
-            if orb_beta.occupations[ibeta] == 0.0:
-                continue
-            correction += np.dot(
-                orb_alpha.coeffs[:, ialpha],
-                np.dot(overlap, orb_beta.coeffs[:, ibeta])) ** 2
+    # Overlaps between all pairs of occupied alpha and beta orbitals, in one go.
+    coeffs_alpha = orb_alpha.coeffs[:, orb_alpha.occupations != 0.0]
+    coeffs_beta = orb_beta.coeffs[:, orb_beta.occupations != 0.0]
+    pair_overlaps = np.dot(coeffs_alpha.T, np.dot(overlap, coeffs_beta))
+    correction = np.vdot(pair_overlaps, pair_overlaps)
 
     ssq = sz * (sz + 1) + nbeta - correction
     print(sz, ssq)
@@ -102,6 +98,9 @@ def get_homo_lumo(*orbs):
 def compute_commutator(dm, fock, overlap):
     """Compute the dm-fock commutator, including an overlap matrix
 
+    All three matrices must be symmetric. Then ``fock.dm.overlap`` is the transpose of
+    ``overlap.dm.fock`` and only one triple product needs to be computed.
+
     Parameters
     ----------
     dm
@@ -115,7 +114,37 @@ def compute_commutator(dm, fock, overlap):
     ------
     commutator
     """
-    return np.dot(overlap, np.dot(dm, fock)) - np.dot(fock, np.dot(dm, overlap))
+    sdf = np.dot(overlap, np.dot(dm, fock))
+    return sdf - sdf.T
+
+
+def axpby(a, x, b, y):
+    """Compute ``a * x + b * y`` in-place in ``y``.
+
+    Parameters
+    ----------
+    a, b : float
+        The scale factors.
+    x : np.ndarray
+        An input array, with the same shape as y.
+    y : np.ndarray
+        The input and output array.
+
+    Returns
+    -------
+    y
+    """
+    if x.flags.c_contiguous and y.flags.c_contiguous and \
+            x.dtype == np.float64 and y.dtype == np.float64:
+        # Two BLAS level-1 calls on flat views, without temporary arrays.
+        y_flat = y.reshape(-1)
+        if b != 1.0:
+            dscal(b, y_flat)
+        daxpy(x.reshape(-1), y_flat, a=a)
+    else:
+        y *= b
+        y += a * x
+    return y
 
 
 def doc_inherit(base_class):